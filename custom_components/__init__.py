@@ -3,12 +3,12 @@ from __future__ import annotations
 from datetime import timedelta
 import logging
 
-import aiohttp
 import async_timeout
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY, Platform
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
@@ -19,8 +19,9 @@ from .const import (
     DEFAULT_UPDATE_INTERVAL,
     API_SITE_DATA,  # Replaced API_CURRENT_CONDITIONS
     API_SITE_IMAGES,  # Corrected to API_SITE_IMAGES
-    API_HEADERS,
+    DATA_API_POOL,
 )
+from .api import ATMSClient, ATMSAuthError, entry_api_keys
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,45 +37,37 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up MDT RWIS from a config entry."""
-    api_key = entry.data[CONF_API_KEY]
+    api_keys = entry_api_keys(entry.data)
     site_id = entry.data[CONF_SITE_ID]
     update_interval = entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-    session = async_get_clientsession(hass)
+
+    # All entries share one key pool so the request budget is spread across keys
+    client = hass.data[DOMAIN].get(DATA_API_POOL)
+    if client is None:
+        client = ATMSClient(async_get_clientsession(hass), api_keys)
+        hass.data[DOMAIN][DATA_API_POOL] = client
+    else:
+        client.add_keys(api_keys)
 
     async def async_update_data():
         """Fetch data from API for the selected site."""
         try:
             async with async_timeout.timeout(10):
-                # Use formatted URLs with dynamic substitution
-                weather_url = API_SITE_DATA.format(site_id=site_id, api_key=api_key)
-                camera_url = API_SITE_IMAGES.format(site_id=site_id, api_key=api_key)
-                
                 # Fetch weather data
-                _LOGGER.debug("Fetching weather data from %s", weather_url)
-                async with session.get(weather_url, headers=API_HEADERS) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        _LOGGER.error("Weather data fetch failed: %s - %s", resp.status, text)
-                        raise UpdateFailed(f"Error fetching weather data: {resp.status}")
-                    
-                    weather_data = await resp.json()
-                    _LOGGER.debug("Weather data received: %s", weather_data)
+                weather_data = await client.async_get(API_SITE_DATA, site_id=site_id)
+                _LOGGER.debug("Weather data received: %s", weather_data)
 
                 # Fetch camera data
-                _LOGGER.debug("Fetching camera data from %s", camera_url)
-                async with session.get(camera_url, headers=API_HEADERS) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        _LOGGER.error("Camera data fetch failed: %s - %s", resp.status, text)
-                        raise UpdateFailed(f"Error fetching camera data: {resp.status}")
-                    
-                    camera_data = await resp.json()
-                    _LOGGER.debug("Camera data received: %s", camera_data)
+                camera_data = await client.async_get(API_SITE_IMAGES, site_id=site_id)
+                _LOGGER.debug("Camera data received: %s", camera_data)
 
                 return {
                     "weather": weather_data,
                     "cameras": camera_data,
                 }
+        except ATMSAuthError as err:
+            # Every key was rejected, let the user enter new ones
+            raise ConfigEntryAuthFailed(f"MDT API keys were rejected: {err}") from err
         except Exception as err:
             _LOGGER.error("Error fetching data: %s", err)
             raise UpdateFailed(f"Error fetching data: {err}")
@@ -93,7 +86,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Store coordinator and configuration data for access by platforms
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
-        "api_key": api_key,
+        "client": client,
         "site_id": site_id,
     }
 
@@ -110,4 +103,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Rebuild the shared key pool from the entries still loaded
+        api_keys = []
+        for other in hass.config_entries.async_entries(DOMAIN):
+            if other.entry_id not in hass.data[DOMAIN]:
+                continue
+            for api_key in entry_api_keys(other.data):
+                if api_key not in api_keys:
+                    api_keys.append(api_key)
+        if api_keys:
+            hass.data[DOMAIN][DATA_API_POOL].set_keys(api_keys)
+        else:
+            hass.data[DOMAIN].pop(DATA_API_POOL)
     return unload_ok
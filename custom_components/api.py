@@ -0,0 +1,341 @@
+"""ATMS API client with a pool of MDT API keys."""
+from __future__ import annotations
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+import aiohttp
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_API_KEY,
+    CONF_API_KEYS,
+    API_ALL_SITES,
+    API_SITE_DATA,
+    API_HEADERS,
+    DEFAULT_RATE_LIMIT_COOLDOWN,
+    DEFAULT_INVALID_KEY_COOLDOWN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+RATE_LIMIT_REMAINING_HEADER = "X-RateLimit-Remaining"
+RETRY_AFTER_HEADER = "Retry-After"
+
+
+def parse_api_keys(value: str) -> list[str]:
+    """Split a comma, semicolon or whitespace separated string into API keys."""
+    keys = []
+    for key in value.replace(",", " ").replace(";", " ").split():
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def entry_api_keys(data: Mapping[str, Any]) -> list[str]:
+    """Return the API keys stored in config entry data."""
+    return list(data.get(CONF_API_KEYS) or [data[CONF_API_KEY]])
+
+
+def mask_api_key(api_key: str) -> str:
+    """Return a representation of an API key that is safe to expose."""
+    if len(api_key) <= 4:
+        return "****"
+    return f"****{api_key[-4:]}"
+
+
+async def async_validate_api_keys(
+    session: aiohttp.ClientSession, api_keys: list[str]
+) -> Any:
+    """Validate each API key and return the statewide site list.
+
+    The site list is fetched once, with the first key that answers 200.
+    The remaining keys are checked against a single site to save quota.
+    """
+    sites = None
+    for api_key in api_keys:
+        if sites is None or not sites.get("features"):
+            sites = await _async_check_key(session, API_ALL_SITES.format(api_key=api_key))
+            continue
+        site_id = sites["features"][0]["properties"]["id"]
+        await _async_check_key(
+            session, API_SITE_DATA.format(site_id=site_id, api_key=api_key)
+        )
+
+    if sites is None:
+        raise ATMSNoKeyAvailable("All MDT API keys are rate limited")
+    return sites
+
+
+async def _async_check_key(session: aiohttp.ClientSession, url: str) -> Any:
+    """Request a URL, returning its JSON or None when the key is rate limited."""
+    try:
+        async with session.get(url, headers=API_HEADERS) as resp:
+            if resp.status == 401:
+                raise ATMSAuthError("MDT API key was rejected")
+            if resp.status == 429:
+                return None
+            if resp.status != 200:
+                raise ATMSConnectionError(f"Error validating API key: {resp.status}")
+            return await resp.json()
+    except aiohttp.ClientError as err:
+        raise ATMSConnectionError(f"Error connecting to API: {err}") from err
+
+
+class ApiKeyState:
+    """Usage and availability of a single API key."""
+
+    def __init__(self, api_key: str):
+        """Initialize the key state."""
+        self.api_key = api_key
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.unauthorized = 0
+        self.rate_limited = 0
+        self.remaining: int | None = None
+        self.invalid = False
+        self.cooldown_until: datetime | None = None
+        self.last_used: datetime | None = None
+        self.last_status: int | None = None
+
+    def is_available(self, now: datetime) -> bool:
+        """Return True if the key can be used for a request."""
+        return self.cooldown_until is None or self.cooldown_until <= now
+
+    def reset(self) -> None:
+        """Make the key available again, keeping its counters."""
+        self.invalid = False
+        self.cooldown_until = None
+        self.remaining = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return usage statistics for the key."""
+        now = dt_util.utcnow()
+        return {
+            "key": mask_api_key(self.api_key),
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "unauthorized": self.unauthorized,
+            "rate_limited": self.rate_limited,
+            "remaining_quota": self.remaining,
+            "available": self.is_available(now),
+            "invalid": self.invalid,
+            "cooldown_until": (
+                self.cooldown_until.isoformat()
+                if self.cooldown_until and self.cooldown_until > now
+                else None
+            ),
+            "last_used": self.last_used.isoformat() if self.last_used else None,
+            "last_status": self.last_status,
+        }
+
+
+class ATMSClient:
+    """Client for the MDT ATMS API spreading requests across several API keys.
+
+    Requests go to the available key with the smallest share of its quota
+    used so far. A key's quota is its request count plus the remaining quota
+    reported by the API; keys that do not report one are assumed to have the
+    average quota of the keys that do, so unreported keys are simply the
+    least used ones when no key reports a quota. A key answering 401 rests
+    for several hours and a key answering 429 until its Retry-After time;
+    the request is then retried with the next key.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, api_keys: list[str]):
+        """Initialize the client."""
+        self._session = session
+        self._keys: dict[str, ApiKeyState] = {}
+        self._listeners: list[Callable[[], None]] = []
+        self.add_keys(api_keys)
+
+    @property
+    def api_keys(self) -> list[str]:
+        """Return all API keys in the pool."""
+        return list(self._keys)
+
+    def add_keys(self, api_keys: list[str]) -> None:
+        """Add API keys missing from the pool, leaving existing keys alone."""
+        for api_key in api_keys:
+            if api_key not in self._keys:
+                self._keys[api_key] = ApiKeyState(api_key)
+        self._notify()
+
+    def reset_keys(self, api_keys: list[str]) -> None:
+        """Make the given keys available again, keeping their counters."""
+        for api_key in api_keys:
+            if api_key in self._keys:
+                self._keys[api_key].reset()
+        self._notify()
+
+    def set_keys(self, api_keys: list[str]) -> None:
+        """Replace the keys in the pool, keeping the state of retained keys."""
+        self._keys = {
+            api_key: self._keys.get(api_key) or ApiKeyState(api_key)
+            for api_key in api_keys
+        }
+        self._notify()
+
+    def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Listen for pool usage changes, returning a callback to stop listening."""
+        self._listeners.append(update_callback)
+
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _notify(self) -> None:
+        """Tell listeners the pool changed."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _available_keys(self) -> list[ApiKeyState]:
+        """Return available keys ordered by preference."""
+        now = dt_util.utcnow()
+        available = [state for state in self._keys.values() if state.is_available(now)]
+
+        reported = [
+            state.requests + state.remaining
+            for state in self._keys.values()
+            if state.remaining is not None
+        ]
+        default_quota = sum(reported) / len(reported) if reported else 1
+
+        def load(state: ApiKeyState) -> float:
+            if state.remaining is None:
+                quota = default_quota
+            else:
+                quota = state.requests + state.remaining
+            return state.requests / quota if quota else float("inf")
+
+        return sorted(
+            available,
+            key=lambda state: (
+                state.remaining == 0,
+                load(state),
+                -(state.remaining or 0),
+            ),
+        )
+
+    async def async_get(self, url_template: str, **params: Any) -> Any:
+        """Fetch JSON from an API URL template, failing over between keys."""
+        candidates = self._available_keys()
+        if not candidates:
+            if self._keys and all(state.invalid for state in self._keys.values()):
+                raise ATMSAuthError("All MDT API keys were rejected")
+            raise ATMSNoKeyAvailable("No MDT API key is currently available")
+
+        try:
+            for state in candidates:
+                url = url_template.format(api_key=state.api_key, **params)
+                state.requests += 1
+                state.last_used = dt_util.utcnow()
+                _LOGGER.debug(
+                    "Fetching %s with API key %s",
+                    url_template.format(api_key=mask_api_key(state.api_key), **params),
+                    mask_api_key(state.api_key),
+                )
+                try:
+                    async with self._session.get(url, headers=API_HEADERS) as resp:
+                        state.last_status = resp.status
+                        self._update_remaining(state, resp)
+
+                        if resp.status == 401:
+                            state.unauthorized += 1
+                            state.failures += 1
+                            state.invalid = True
+                            state.cooldown_until = dt_util.utcnow() + timedelta(
+                                minutes=DEFAULT_INVALID_KEY_COOLDOWN
+                            )
+                            _LOGGER.warning(
+                                "API key %s was rejected, retrying it after %s",
+                                mask_api_key(state.api_key),
+                                state.cooldown_until,
+                            )
+                            continue
+
+                        if resp.status == 429:
+                            state.rate_limited += 1
+                            state.failures += 1
+                            state.cooldown_until = dt_util.utcnow() + self._retry_after(resp)
+                            _LOGGER.warning(
+                                "API key %s is rate limited until %s, trying the next key",
+                                mask_api_key(state.api_key),
+                                state.cooldown_until,
+                            )
+                            continue
+
+                        if resp.status != 200:
+                            state.failures += 1
+                            text = await resp.text()
+                            _LOGGER.error("Request failed: %s - %s", resp.status, text)
+                            raise ATMSConnectionError(f"Error fetching data: {resp.status}")
+
+                        data = await resp.json()
+                        state.successes += 1
+                        state.invalid = False
+                        return data
+                except aiohttp.ClientError as err:
+                    state.failures += 1
+                    raise ATMSConnectionError(f"Error connecting to API: {err}") from err
+        finally:
+            self._notify()
+
+        if all(state.invalid for state in self._keys.values()):
+            raise ATMSAuthError("All MDT API keys were rejected")
+        raise ATMSNoKeyAvailable("All MDT API keys are rate limited or invalid")
+
+    @staticmethod
+    def _update_remaining(state: ApiKeyState, resp: aiohttp.ClientResponse) -> None:
+        """Record the remaining quota reported by the API, if any."""
+        remaining = resp.headers.get(RATE_LIMIT_REMAINING_HEADER)
+        if remaining is None:
+            return
+        try:
+            state.remaining = int(remaining)
+        except ValueError:
+            _LOGGER.debug("Ignoring invalid %s header: %s", RATE_LIMIT_REMAINING_HEADER, remaining)
+
+    @staticmethod
+    def _retry_after(resp: aiohttp.ClientResponse) -> timedelta:
+        """Return how long a rate limited key should rest."""
+        retry_after = resp.headers.get(RETRY_AFTER_HEADER)
+        if retry_after is not None:
+            try:
+                return timedelta(seconds=int(retry_after))
+            except ValueError:
+                pass
+        return timedelta(minutes=DEFAULT_RATE_LIMIT_COOLDOWN)
+
+    @property
+    def usage(self) -> dict[str, dict[str, Any]]:
+        """Return usage statistics for each key, keyed by position in the pool."""
+        return {
+            f"key_{index}": state.as_dict()
+            for index, state in enumerate(self._keys.values(), start=1)
+        }
+
+    @property
+    def available_key_count(self) -> int:
+        """Return the number of keys that can currently be used."""
+        now = dt_util.utcnow()
+        return sum(1 for state in self._keys.values() if state.is_available(now))
+
+
+class ATMSError(HomeAssistantError):
+    """Base error for the ATMS API client."""
+
+class ATMSConnectionError(ATMSError):
+    """Error to indicate the API could not be reached or returned an error."""
+
+class ATMSAuthError(ATMSError):
+    """Error to indicate the API keys were rejected."""
+
+class ATMSNoKeyAvailable(ATMSError):
+    """Error to indicate every API key is rate limited or invalid."""
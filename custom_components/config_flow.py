@@ -3,22 +3,31 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries, exceptions
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DOMAIN,
     NAME,
     CONF_API_KEY,
+    CONF_API_KEYS,
     CONF_SITE_ID,
     CONF_UPDATE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
     API_ALL_SITES,
-    API_HEADERS,
+    DATA_API_POOL,
+)
+from .api import (
+    ATMSClient,
+    ATMSAuthError,
+    ATMSError,
+    async_validate_api_keys,
+    entry_api_keys,
+    parse_api_keys,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,27 +39,29 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self):
         """Initialize flow."""
-        self.api_key = None
+        self.api_keys = None
         self.sites = None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step to enter the API key."""
+        """Handle the initial step to enter one or more API keys."""
         errors = {}
 
-        # Check if an entry with the API key already exists
+        # Check if an entry with API keys already exists
         existing_entries = self.hass.config_entries.async_entries(DOMAIN)
         if existing_entries:
-            # Use the existing API key
-            self.api_key = existing_entries[0].data[CONF_API_KEY]
+            # Use the existing key pool
+            self.api_keys = self._existing_api_keys(existing_entries)
             return await self.async_step_site()
 
         if user_input is not None:
-            self.api_key = user_input[CONF_API_KEY]
+            self.api_keys = parse_api_keys(user_input[CONF_API_KEY])
             try:
-                # Validate API key by attempting to fetch all sites
-                self.sites = await self._fetch_all_sites(self.api_key)
+                # Validate each API key, keeping the site list from the first one
+                self.sites = _sites_by_id(
+                    await _async_validate_keys(self.hass, self.api_keys)
+                )
                 return await self.async_step_site()
             except InvalidAuth:
                 errors["base"] = "invalid_auth"
@@ -77,7 +88,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if not self.sites:
             # Attempt to fetch sites again if they weren't fetched previously
             try:
-                self.sites = await self._fetch_all_sites(self.api_key)
+                self.sites = await self._fetch_all_sites(self.api_keys)
             except CannotConnect:
                 return self.async_abort(reason="cannot_connect")
             except InvalidAuth:
@@ -91,7 +102,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_create_entry(
                 title=f"{NAME} - {self.sites[site_id]}",
                 data={
-                    CONF_API_KEY: self.api_key,
+                    CONF_API_KEY: self.api_keys[0],
+                    CONF_API_KEYS: self.api_keys,
                     CONF_SITE_ID: site_id,
                     CONF_UPDATE_INTERVAL: user_input.get(
                         CONF_UPDATE_INTERVAL,
@@ -115,26 +127,164 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
-    async def _fetch_all_sites(self, api_key: str) -> dict:
+    async def async_step_reauth(self, entry_data: dict[str, Any]) -> FlowResult:
+        """Handle reauthentication when every API key was rejected."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for new API keys for the shared key pool."""
+        errors = {}
+
+        if user_input is not None:
+            api_keys = parse_api_keys(user_input[CONF_API_KEY])
+            try:
+                await _async_validate_keys(self.hass, api_keys)
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except Exception as err:
+                _LOGGER.exception("Unexpected error during API key validation: %s", err)
+                errors["base"] = "unknown"
+            else:
+                _async_update_api_keys(self.hass, api_keys, reset=True)
+                for entry in self.hass.config_entries.async_entries(DOMAIN):
+                    await self.hass.config_entries.async_reload(entry.entry_id)
+                return self.async_abort(reason="reauth_successful")
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({
+                vol.Required(CONF_API_KEY): str,
+            }),
+            errors=errors,
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlow:
+        """Get the options flow for editing the API key pool."""
+        return OptionsFlow(config_entry)
+
+    def _existing_api_keys(self, entries: list[config_entries.ConfigEntry]) -> list[str]:
+        """Return the API keys already in use by configured entries."""
+        client = self.hass.data.get(DOMAIN, {}).get(DATA_API_POOL)
+        if client is not None:
+            return client.api_keys
+
+        api_keys = []
+        for entry in entries:
+            for api_key in entry_api_keys(entry.data):
+                if api_key not in api_keys:
+                    api_keys.append(api_key)
+        return api_keys
+
+    async def _fetch_all_sites(self, api_keys: list[str]) -> dict:
         """Fetch all available sites to provide options for user selection."""
-        session = aiohttp.ClientSession()
-        url = API_ALL_SITES.format(api_key=api_key)
-        _LOGGER.debug("Fetching all sites with URL: %s", url)
-
-        async with session.get(url, headers=API_HEADERS) as resp:
-            if resp.status == 401:
-                _LOGGER.error("Invalid authentication: %s", resp.status)
-                raise InvalidAuth
-            if resp.status != 200:
-                _LOGGER.error("Failed to connect to site API: %s", resp.status)
-                raise CannotConnect
-
-            data = await resp.json()
-            _LOGGER.debug("Sites data received: %s", data)
-            return {
-                str(site["properties"]["id"]): site["properties"]["name"]
-                for site in data["features"]
-            }
+        client = self.hass.data.get(DOMAIN, {}).get(DATA_API_POOL)
+        if client is None:
+            client = ATMSClient(async_get_clientsession(self.hass), api_keys)
+
+        try:
+            data = await client.async_get(API_ALL_SITES)
+        except ATMSAuthError as err:
+            _LOGGER.error("Invalid authentication: %s", err)
+            raise InvalidAuth from err
+        except ATMSError as err:
+            _LOGGER.error("Failed to connect to site API: %s", err)
+            raise CannotConnect from err
+
+        return _sites_by_id(data)
+
+class OptionsFlow(config_entries.OptionsFlow):
+    """Edit the API key pool shared by all MDT RWIS entries."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle editing the API keys."""
+        errors = {}
+        current_keys = entry_api_keys(self._entry.data)
+
+        if user_input is not None:
+            api_keys = parse_api_keys(user_input[CONF_API_KEYS])
+            new_keys = [api_key for api_key in api_keys if api_key not in current_keys]
+            try:
+                if not api_keys:
+                    raise InvalidAuth
+                if new_keys:
+                    await _async_validate_keys(self.hass, new_keys)
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except Exception as err:
+                _LOGGER.exception("Unexpected error during API key validation: %s", err)
+                errors["base"] = "unknown"
+            else:
+                _async_update_api_keys(self.hass, api_keys)
+                return self.async_create_entry(title="", data={})
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_API_KEYS,
+                    default=", ".join(current_keys)
+                ): str,
+            }),
+            errors=errors,
+        )
+
+def _sites_by_id(data: dict) -> dict:
+    """Map site IDs to names from the statewide site list."""
+    _LOGGER.debug("Sites data received: %s", data)
+    return {
+        str(site["properties"]["id"]): site["properties"]["name"]
+        for site in data["features"]
+    }
+
+async def _async_validate_keys(hass: HomeAssistant, api_keys: list[str]) -> dict:
+    """Validate API keys and return the statewide site list."""
+    if not api_keys:
+        raise InvalidAuth
+    try:
+        return await async_validate_api_keys(async_get_clientsession(hass), api_keys)
+    except ATMSAuthError as err:
+        _LOGGER.error("Invalid authentication: %s", err)
+        raise InvalidAuth from err
+    except ATMSError as err:
+        _LOGGER.error("Failed to connect to site API: %s", err)
+        raise CannotConnect from err
+
+@callback
+def _async_update_api_keys(
+    hass: HomeAssistant, api_keys: list[str], reset: bool = False
+) -> None:
+    """Store API keys on every entry and in the shared key pool.
+
+    Retained keys keep their cooldowns unless reset is set, which reauth
+    uses for the keys the user entered again.
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**entry.data, CONF_API_KEY: api_keys[0], CONF_API_KEYS: api_keys},
+        )
+
+    client = hass.data.get(DOMAIN, {}).get(DATA_API_POOL)
+    if client is not None:
+        client.set_keys(api_keys)
+        if reset:
+            client.reset_keys(api_keys)
 
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -5,6 +5,7 @@ NAME = "Montana DOT RWIS"
 
 # Configuration
 CONF_API_KEY = "api_key"
+CONF_API_KEYS = "api_keys"
 CONF_SITE_ID = "site_id"
 CONF_UPDATE_INTERVAL = "update_interval"
 
@@ -14,6 +15,9 @@ API_ALL_SITES = f"{API_BASE_URL}/current?apiKey={{api_key}}"
 API_SITE_DATA = f"{API_BASE_URL}/current/site?siteId={{site_id}}&apiKey={{api_key}}"
 API_SITE_IMAGES = f"{API_BASE_URL}/current/images/site?siteId={{site_id}}&apiKey={{api_key}}"
 
+# Shared API key pool stored in hass.data[DOMAIN]
+DATA_API_POOL = "api_pool"
+
 # Headers
 API_HEADERS = {
     "accept": "application/json"
@@ -23,6 +27,9 @@ API_HEADERS = {
 DEFAULT_UPDATE_INTERVAL = 15  # minutes
 MIN_UPDATE_INTERVAL = 1
 MAX_UPDATE_INTERVAL = 60
+DEFAULT_RATE_LIMIT_COOLDOWN = 15  # minutes, one data refresh cycle
+DEFAULT_INVALID_KEY_COOLDOWN = 360  # minutes before a rejected key is retried
+KEY_USAGE_UPDATE_COOLDOWN = 60  # seconds between key usage sensor updates
 
 
 # Device class and units for various sensors
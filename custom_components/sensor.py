@@ -11,13 +11,15 @@ from homeassistant.const import (
     PERCENTAGE,
     UnitOfLength,
     DEGREE,
+    EntityCategory,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, KEY_USAGE_UPDATE_COOLDOWN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +30,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up MDT RWIS sensors."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    client = hass.data[DOMAIN][config_entry.entry_id]["client"]
     
     _LOGGER.debug("Setting up sensors with coordinator data: %s", coordinator.data)
     
@@ -48,6 +51,7 @@ async def async_setup_entry(
             RWISWindDirectionSensor(coordinator, station["id"]),
             RWISDewPointSensor(coordinator, station["id"]),
             RWISPrecipitationRateSensor(coordinator, station["id"]),
+            RWISApiKeyUsageSensor(coordinator, station["id"], client),
         ])
     else:
         _LOGGER.error("No weather data available in coordinator: %s", coordinator.data)
@@ -218,3 +222,42 @@ class RWISPrecipitationRateSensor(RWISBaseSensor):
             return atmos["precipRate"]["value"]
         return None
 
+class RWISApiKeyUsageSensor(RWISBaseSensor):
+    """Diagnostic sensor reporting usage of the shared API key pool."""
+
+    # The per-key statistics are too large and noisy for the history database
+    _unrecorded_attributes = frozenset({"keys"})
+
+    def __init__(self, coordinator, station_id, client):
+        """Initialize the sensor."""
+        super().__init__(coordinator, station_id)
+        station_data = self._get_station_data()
+        self._client = client
+
+        self._attr_name = f"RWIS {station_data['properties']['name']} Available API Keys"
+        self._attr_unique_id = f"{station_id}_api_key_usage"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = "mdi:key-chain"
+
+    async def async_added_to_hass(self) -> None:
+        """Update when any entry uses the shared key pool, at most once a minute."""
+        await super().async_added_to_hass()
+        debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=KEY_USAGE_UPDATE_COOLDOWN,
+            immediate=False,
+            function=self.async_write_ha_state,
+        )
+        self.async_on_remove(self._client.async_add_listener(debouncer.async_schedule_call))
+        self.async_on_remove(debouncer.async_cancel)
+
+    @property
+    def native_value(self):
+        """Return the number of API keys that can currently be used."""
+        return self._client.available_key_count
+
+    @property
+    def extra_state_attributes(self):
+        """Return usage statistics for each API key."""
+        return {"keys": self._client.usage}
@@ -0,0 +1 @@
+"""Tests for the MDT RWIS integration."""
@@ -0,0 +1,84 @@
+"""Shared fakes for the MDT RWIS tests."""
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from custom_components.const import DOMAIN
+
+SITES = {"features": [{"properties": {"id": 1, "name": "Bozeman Pass"}}]}
+
+
+class FakeResponse:
+    """Minimal aiohttp response."""
+
+    def __init__(self, status=200, headers=None, data=None):
+        self.status = status
+        self.headers = headers or {}
+        self._data = data if data is not None else SITES
+
+    async def json(self):
+        return self._data
+
+    async def text(self):
+        return str(self._data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    """Session answering per API key and recording which key was used."""
+
+    def __init__(self, responder):
+        self._responder = responder
+        self.calls = []
+
+    def get(self, url, headers=None):
+        api_key = parse_qs(urlparse(url).query)["apiKey"][0]
+        self.calls.append((api_key, url))
+        return self._responder(api_key)
+
+    @property
+    def keys_used(self):
+        return [api_key for api_key, _ in self.calls]
+
+
+class FakeConfigEntries:
+    """Config entry manager holding a fixed list of entries."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.reloaded = []
+
+    def async_entries(self, domain):
+        return list(self.entries)
+
+    def async_update_entry(self, entry, data):
+        entry.data = data
+
+    async def async_forward_entry_setups(self, entry, platforms):
+        return None
+
+    async def async_unload_platforms(self, entry, platforms):
+        return True
+
+    async def async_reload(self, entry_id):
+        self.reloaded.append(entry_id)
+
+
+def make_entry(entry_id, api_keys, site_id="1"):
+    """Return a config entry using the given API keys."""
+    return SimpleNamespace(
+        entry_id=entry_id,
+        data={"api_key": api_keys[0], "api_keys": api_keys, "site_id": site_id},
+    )
+
+
+def make_hass(entries):
+    """Return a minimal hass with the integration set up."""
+    return SimpleNamespace(
+        data={DOMAIN: {}},
+        config_entries=FakeConfigEntries(entries),
+    )
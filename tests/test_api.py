@@ -0,0 +1,217 @@
+"""Tests for the MDT ATMS API key pool."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.api import (
+    ATMSClient,
+    ATMSAuthError,
+    ATMSNoKeyAvailable,
+    async_validate_api_keys,
+)
+from custom_components.const import (
+    API_ALL_SITES,
+    API_SITE_DATA,
+    DEFAULT_INVALID_KEY_COOLDOWN,
+    DEFAULT_RATE_LIMIT_COOLDOWN,
+)
+
+from tests.common import SITES, FakeResponse, FakeSession
+
+
+def fetch(client, times=1):
+    """Run client requests for the all sites endpoint."""
+    async def run():
+        for _ in range(times):
+            await client.async_get(API_ALL_SITES)
+
+    asyncio.run(run())
+
+
+def test_keys_without_quota_are_used_round_robin():
+    session = FakeSession(lambda api_key: FakeResponse())
+    client = ATMSClient(session, ["A", "B", "C"])
+
+    fetch(client, 6)
+
+    assert session.keys_used == ["A", "B", "C", "A", "B", "C"]
+
+
+def test_requests_spread_by_remaining_quota():
+    remaining = {"A": 5, "B": 100}
+
+    def responder(api_key):
+        if api_key not in remaining:
+            return FakeResponse()
+        remaining[api_key] -= 1
+        return FakeResponse(headers={"X-RateLimit-Remaining": str(remaining[api_key])})
+
+    session = FakeSession(responder)
+    client = ATMSClient(session, ["A", "B", "C"])
+
+    fetch(client, 30)
+
+    # Every key is tried once to learn its quota
+    assert session.keys_used[:3] == ["A", "B", "C"]
+    counts = {api_key: session.keys_used.count(api_key) for api_key in "ABC"}
+    assert counts["B"] > counts["C"] > counts["A"]
+
+
+def test_rejected_key_fails_over_and_rests():
+    session = FakeSession(
+        lambda api_key: FakeResponse(status=401 if api_key == "A" else 200)
+    )
+    client = ATMSClient(session, ["A", "B"])
+
+    assert asyncio.run(client.async_get(API_ALL_SITES)) == SITES
+    assert session.keys_used == ["A", "B"]
+
+    stats = client.usage["key_1"]
+    assert stats["invalid"] is True
+    assert stats["available"] is False
+    assert stats["unauthorized"] == 1
+    cooldown = dt_util.parse_datetime(stats["cooldown_until"]) - dt_util.utcnow()
+    assert cooldown > timedelta(minutes=DEFAULT_INVALID_KEY_COOLDOWN - 1)
+
+    fetch(client)
+    assert session.keys_used[-1] == "B"
+
+
+def test_reset_key_is_available_again():
+    session = FakeSession(lambda api_key: FakeResponse(status=401))
+    client = ATMSClient(session, ["A"])
+
+    with pytest.raises(ATMSAuthError):
+        fetch(client)
+    assert client.available_key_count == 0
+
+    client.reset_keys(["A"])
+
+    assert client.available_key_count == 1
+    assert client.usage["key_1"]["invalid"] is False
+    assert client.usage["key_1"]["requests"] == 1
+
+
+def test_add_keys_keeps_existing_key_state():
+    session = FakeSession(lambda api_key: FakeResponse(status=429))
+    client = ATMSClient(session, ["A", "B"])
+
+    with pytest.raises(ATMSNoKeyAvailable):
+        fetch(client)
+
+    client.add_keys(["A", "B", "C"])
+
+    assert client.api_keys == ["A", "B", "C"]
+    assert client.available_key_count == 1
+    assert client.usage["key_1"]["cooldown_until"] is not None
+
+
+def test_all_keys_rejected():
+    session = FakeSession(lambda api_key: FakeResponse(status=401))
+    client = ATMSClient(session, ["A", "B"])
+
+    with pytest.raises(ATMSAuthError):
+        fetch(client)
+    # Rejected keys resting on cooldown still report an auth failure
+    with pytest.raises(ATMSAuthError):
+        fetch(client)
+    assert session.keys_used == ["A", "B"]
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"Retry-After": "120"}, timedelta(seconds=120)),
+        (
+            {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"},
+            timedelta(minutes=DEFAULT_RATE_LIMIT_COOLDOWN),
+        ),
+        ({}, timedelta(minutes=DEFAULT_RATE_LIMIT_COOLDOWN)),
+    ],
+)
+def test_rate_limited_key_rests_for_retry_after(headers, expected):
+    session = FakeSession(
+        lambda api_key: FakeResponse(status=429, headers=headers)
+        if api_key == "A"
+        else FakeResponse()
+    )
+    client = ATMSClient(session, ["A", "B"])
+
+    before = dt_util.utcnow()
+    fetch(client)
+
+    assert session.keys_used == ["A", "B"]
+    stats = client.usage["key_1"]
+    assert stats["rate_limited"] == 1
+    cooldown = dt_util.parse_datetime(stats["cooldown_until"]) - before
+    assert expected <= cooldown < expected + timedelta(seconds=5)
+
+
+def test_all_keys_rate_limited():
+    session = FakeSession(lambda api_key: FakeResponse(status=429))
+    client = ATMSClient(session, ["A", "B"])
+
+    with pytest.raises(ATMSNoKeyAvailable):
+        fetch(client)
+    with pytest.raises(ATMSNoKeyAvailable):
+        fetch(client)
+    assert session.keys_used == ["A", "B"]
+
+
+def test_usage_keyed_by_position():
+    client = ATMSClient(FakeSession(lambda api_key: FakeResponse()), ["abc", "xyz", "1234"])
+
+    usage = client.usage
+
+    assert list(usage) == ["key_1", "key_2", "key_3"]
+    assert {stats["key"] for stats in usage.values()} == {"****"}
+
+
+def test_set_keys_keeps_state_of_retained_keys():
+    session = FakeSession(lambda api_key: FakeResponse())
+    client = ATMSClient(session, ["A", "B"])
+    fetch(client, 2)
+
+    client.set_keys(["B", "C"])
+
+    assert client.api_keys == ["B", "C"]
+    assert client.usage["key_1"]["requests"] == 1
+    assert client.usage["key_2"]["requests"] == 0
+
+
+def test_listeners_notified_after_requests():
+    client = ATMSClient(FakeSession(lambda api_key: FakeResponse()), ["A"])
+    updates = []
+    remove = client.async_add_listener(lambda: updates.append(True))
+
+    fetch(client)
+    remove()
+    fetch(client)
+
+    assert len(updates) == 1
+
+
+def test_validate_fetches_statewide_list_once():
+    session = FakeSession(lambda api_key: FakeResponse())
+
+    sites = asyncio.run(async_validate_api_keys(session, ["A", "B", "C"]))
+
+    assert sites == SITES
+    urls = [url for _, url in session.calls]
+    assert urls == [
+        API_ALL_SITES.format(api_key="A"),
+        API_SITE_DATA.format(site_id=1, api_key="B"),
+        API_SITE_DATA.format(site_id=1, api_key="C"),
+    ]
+
+
+def test_validate_rejects_invalid_key():
+    session = FakeSession(
+        lambda api_key: FakeResponse(status=401 if api_key == "B" else 200)
+    )
+
+    with pytest.raises(ATMSAuthError):
+        asyncio.run(async_validate_api_keys(session, ["A", "B"]))
@@ -0,0 +1,127 @@
+"""Tests for the MDT RWIS reauth and options flows."""
+import asyncio
+
+import pytest
+
+from custom_components import config_flow
+from custom_components.api import ATMSClient, ATMSError
+from custom_components.const import API_ALL_SITES, DATA_API_POOL, DOMAIN
+
+from tests.common import FakeResponse, FakeSession, make_entry, make_hass
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Patch the flow session, returning the per-key statuses."""
+    statuses = {}
+    session = FakeSession(lambda api_key: FakeResponse(status=statuses.get(api_key, 200)))
+    monkeypatch.setattr(config_flow, "async_get_clientsession", lambda hass: session)
+    statuses["session"] = session
+    return statuses
+
+
+def make_pool(hass, api_keys, status=None):
+    """Add a key pool, optionally with every key failing with the given status."""
+    session = FakeSession(lambda api_key: FakeResponse(status=status))
+    client = ATMSClient(session, api_keys)
+    if status is not None:
+        with pytest.raises(ATMSError):
+            asyncio.run(client.async_get(API_ALL_SITES))
+    hass.data[DOMAIN][DATA_API_POOL] = client
+    return client
+
+
+def options_flow(hass, entry):
+    flow = config_flow.ConfigFlow.async_get_options_flow(entry)
+    flow.hass = hass
+    return flow
+
+
+def test_options_validates_only_new_keys(responses):
+    entries = [make_entry("first", ["A"]), make_entry("second", ["A"], site_id="2")]
+    hass = make_hass(entries)
+    client = make_pool(hass, ["A"], 429)
+
+    result = asyncio.run(
+        options_flow(hass, entries[0]).async_step_init({"api_keys": "A, B"})
+    )
+
+    assert result["type"] == "create_entry"
+    assert responses["session"].keys_used == ["B"]
+    for entry in entries:
+        assert entry.data["api_keys"] == ["A", "B"]
+    assert client.api_keys == ["A", "B"]
+    # The retained key keeps its rate limit cooldown
+    assert client.usage["key_1"]["cooldown_until"] is not None
+
+
+def test_options_removing_key_skips_validation(responses):
+    entry = make_entry("first", ["A", "B"])
+    hass = make_hass([entry])
+    client = make_pool(hass, ["A", "B"])
+
+    result = asyncio.run(options_flow(hass, entry).async_step_init({"api_keys": "B"}))
+
+    assert result["type"] == "create_entry"
+    assert responses["session"].calls == []
+    assert entry.data["api_key"] == "B"
+    assert client.api_keys == ["B"]
+
+
+@pytest.mark.parametrize(
+    ("user_input", "error"),
+    [(" , ", "invalid_auth"), ("A, B", "invalid_auth")],
+)
+def test_options_errors(responses, user_input, error):
+    entry = make_entry("first", ["A"])
+    hass = make_hass([entry])
+    client = make_pool(hass, ["A"])
+    responses["B"] = 401
+
+    result = asyncio.run(
+        options_flow(hass, entry).async_step_init({"api_keys": user_input})
+    )
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"base": error}
+    assert entry.data["api_keys"] == ["A"]
+    assert client.api_keys == ["A"]
+
+
+def reauth(hass, user_input):
+    flow = config_flow.ConfigFlow()
+    flow.hass = hass
+    return asyncio.run(flow.async_step_reauth_confirm(user_input))
+
+
+def test_reauth_resets_entered_keys(responses):
+    entries = [make_entry("first", ["A", "B"]), make_entry("second", ["A", "B"], site_id="2")]
+    hass = make_hass(entries)
+    client = make_pool(hass, ["A", "B"], 401)
+    assert client.available_key_count == 0
+
+    result = reauth(hass, {"api_key": "A, C"})
+
+    assert result["type"] == "abort"
+    assert result["reason"] == "reauth_successful"
+    for entry in entries:
+        assert entry.data["api_keys"] == ["A", "C"]
+    assert client.api_keys == ["A", "C"]
+    assert client.available_key_count == 2
+    assert client.usage["key_1"]["invalid"] is False
+    assert hass.config_entries.reloaded == ["first", "second"]
+
+
+def test_reauth_rejected_key_keeps_pool(responses):
+    entry = make_entry("first", ["A"])
+    hass = make_hass([entry])
+    client = make_pool(hass, ["A"], 401)
+    responses["C"] = 401
+
+    result = reauth(hass, {"api_key": "C"})
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"base": "invalid_auth"}
+    assert client.api_keys == ["A"]
+    assert client.available_key_count == 0
+    assert hass.config_entries.reloaded == []
@@ -0,0 +1,103 @@
+"""Tests for setting up MDT RWIS entries on the shared key pool."""
+import asyncio
+
+import pytest
+
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+import custom_components
+from custom_components.const import DATA_API_POOL, DOMAIN
+
+from tests.common import FakeResponse, FakeSession, make_entry, make_hass
+
+
+class FakeCoordinator:
+    """Coordinator running the update method on the first refresh."""
+
+    def __init__(self, hass, logger, *, name, update_method, update_interval):
+        self.update_method = update_method
+        self.data = None
+
+    async def async_config_entry_first_refresh(self):
+        self.data = await self.update_method()
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Patch the coordinator and session, returning the per-key statuses."""
+    statuses = {}
+    session = FakeSession(lambda api_key: FakeResponse(status=statuses.get(api_key, 200)))
+    monkeypatch.setattr(custom_components, "DataUpdateCoordinator", FakeCoordinator)
+    monkeypatch.setattr(custom_components, "async_get_clientsession", lambda hass: session)
+    statuses["session"] = session
+    return statuses
+
+
+def setup(hass, entry):
+    """Set up an entry."""
+    return asyncio.run(custom_components.async_setup_entry(hass, entry))
+
+
+def test_entries_share_one_pool(responses):
+    first = make_entry("first", ["A", "B"])
+    second = make_entry("second", ["B", "C"], site_id="2")
+    hass = make_hass([first, second])
+
+    assert setup(hass, first)
+    assert setup(hass, second)
+
+    client = hass.data[DOMAIN][DATA_API_POOL]
+    assert client.api_keys == ["A", "B", "C"]
+    assert hass.data[DOMAIN]["first"]["client"] is client
+    assert hass.data[DOMAIN]["second"]["client"] is client
+
+
+def test_rate_limited_key_stays_on_cooldown_after_next_setup(responses):
+    first = make_entry("first", ["A", "B"])
+    second = make_entry("second", ["A", "B"], site_id="2")
+    hass = make_hass([first, second])
+    setup(hass, first)
+    client = hass.data[DOMAIN][DATA_API_POOL]
+    session = responses["session"]
+
+    responses.update({"A": 429, "B": 429})
+    with pytest.raises(UpdateFailed):
+        asyncio.run(hass.data[DOMAIN]["first"]["coordinator"].update_method())
+    assert client.available_key_count == 0
+    requests_made = len(session.calls)
+
+    with pytest.raises(UpdateFailed):
+        setup(hass, second)
+
+    assert client.available_key_count == 0
+    assert len(session.calls) == requests_made
+
+
+def test_all_keys_rejected_starts_reauth(responses):
+    entry = make_entry("first", ["A", "B"])
+    hass = make_hass([entry])
+    setup(hass, entry)
+
+    responses.update({"A": 401, "B": 401})
+    with pytest.raises(ConfigEntryAuthFailed):
+        asyncio.run(hass.data[DOMAIN]["first"]["coordinator"].update_method())
+
+
+def test_unload_rebuilds_pool_from_remaining_entries(responses):
+    first = make_entry("first", ["A", "B"])
+    second = make_entry("second", ["B", "C"], site_id="2")
+    hass = make_hass([first, second])
+    setup(hass, first)
+    setup(hass, second)
+    client = hass.data[DOMAIN][DATA_API_POOL]
+    requests_on_b = client.usage["key_2"]["requests"]
+
+    assert asyncio.run(custom_components.async_unload_entry(hass, first))
+
+    assert client.api_keys == ["B", "C"]
+    assert client.usage["key_1"]["requests"] == requests_on_b
+
+    assert asyncio.run(custom_components.async_unload_entry(hass, second))
+
+    assert hass.data[DOMAIN] == {}